@@ -0,0 +1,117 @@
+"""
+Startup-time benchmark for workers and CLI jobs.
+
+Imports each module of the app in a fresh interpreter from an empty working
+directory and reports the median time on top of a bare interpreter.
+Fails if an import writes files, if a target goes over its budget, or
+(with --baseline) if it is slower than a previously saved run.
+
+Usage:
+  python bench_startup.py                           # check against budgets
+  python bench_startup.py --src /tmp/old/src --save base.json
+  python bench_startup.py --baseline base.json      # must not be slower
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+TARGETS = {
+    "mapping": "import mapping",
+    "cache": "import cache",
+    "sync": "import sync",
+    "app": "import app",
+    "create_app": "import app; app.create_app()",
+}
+
+# Import cost budgets in ms above a bare interpreter. mapping, cache and
+# sync must not pull in Flask, requests or dateutil; app is mostly Flask.
+BUDGETS_MS = {
+    "mapping": 25,
+    "cache": 25,
+    "sync": 50,
+    "app": 400,
+    "create_app": 450,
+}
+
+# Allowed slowdown against a saved baseline before it counts as a regression:
+# 10% plus a few ms so run-to-run noise on tiny imports doesn't fail the check
+BASELINE_TOLERANCE = 1.10
+BASELINE_SLACK_MS = 5
+
+
+def time_import(stmt, runs, src_dir):
+    env = dict(os.environ, PYTHONPATH=src_dir)
+    timings = []
+    with tempfile.TemporaryDirectory() as cwd:
+        for _ in range(runs):
+            start = time.perf_counter()
+            completed = subprocess.run(
+                [sys.executable, "-c", stmt], cwd=cwd, env=env,
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+            )
+            if completed.returncode != 0:
+                return None, os.listdir(cwd)
+            timings.append(time.perf_counter() - start)
+        side_effects = os.listdir(cwd)
+    return statistics.median(timings), side_effects
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    arg_parser.add_argument("runs", nargs="?", type=int, default=10)
+    arg_parser.add_argument("--src", default=os.path.join(ROOT_DIR, "src"),
+                            help="source directory to benchmark (default: ./src)")
+    arg_parser.add_argument("--save", help="write the measured import costs to this JSON file")
+    arg_parser.add_argument("--baseline", help="fail if slower than the costs in this JSON file")
+    args = arg_parser.parse_args()
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    interpreter, _ = time_import("pass", args.runs, args.src)
+    print(f"{'interpreter':<12} {interpreter * 1000:8.1f} ms")
+
+    costs = {}
+    failures = []
+    for name, stmt in TARGETS.items():
+        median, side_effects = time_import(stmt, args.runs, args.src)
+        if median is None:
+            print(f"{name:<12}   failed to import")
+            costs[name] = None
+            failures.append(f"{name}: import failed")
+            continue
+
+        cost = (median - interpreter) * 1000
+        costs[name] = round(cost, 1)
+        line = f"{name:<12} {median * 1000:8.1f} ms  (+{cost:.1f} ms, budget {BUDGETS_MS[name]} ms"
+        if baseline and baseline.get(name) is not None:
+            line += f", baseline +{baseline[name]:.1f} ms"
+        print(line + ")")
+
+        if side_effects:
+            failures.append(f"{name}: created {', '.join(sorted(side_effects))} on import")
+        if cost > BUDGETS_MS[name]:
+            failures.append(f"{name}: +{cost:.1f} ms is over its {BUDGETS_MS[name]} ms budget")
+        if baseline and baseline.get(name) is not None and cost > baseline[name] * BASELINE_TOLERANCE + BASELINE_SLACK_MS:
+            failures.append(f"{name}: +{cost:.1f} ms is slower than baseline +{baseline[name]:.1f} ms")
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(costs, f, indent=2)
+
+    for failure in failures:
+        print(f"FAIL {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,20 +1,96 @@
-from dotenv import load_dotenv
-from flask import Flask, Response, request, render_template, redirect, jsonify, url_for, session
-from flask_cors import CORS
-from cache import *
-from mapping import *
-from sync import *
+from flask import Blueprint, Flask, request, render_template, redirect, jsonify, url_for, session, current_app
+from cache import delete_plan, load_issues_from_file, load_plan, save_issues_to_file, save_plan, set_cache_dir
+from mapping import load_mappings, set_mappings_path
+from sync import (
+    YOUTRACK_PROJECT_NAME,
+    apply_sync_plan,
+    build_api_url_from_input,
+    get_http,
+    import_one_issue_to_youtrack,
+    plan_import_issues,
+    summarize_sync_plan,
+    sync_github_to_youtrack,
+)
 import os
-import requests
 import re
-load_dotenv()
 
-# --- Flask app and secret key (required for session) ---
-app = Flask(__name__)
-app.secret_key = os.getenv("FLASK_SECRET_KEY") or os.urandom(24)
+bp = Blueprint('main', __name__)
 
-CORS(app)
-@app.route('/github', methods=['GET'])
+
+def is_dry_run():
+    """
+    True if the request asks for a dry run (?dry_run=1 or {"dry_run": true}).
+    """
+    if request.args.get('dry_run', '').lower() in ('1', 'true', 'yes'):
+        return True
+    data = request.get_json(silent=True) or {}
+    return bool(data.get('dry_run'))
+
+
+def replace_plan(plan_id):
+    """
+    Make `plan_id` the pending plan (None to clear it) and delete the plan
+    it replaces. Only the plan id is kept in the session.
+    """
+    old_plan_id = session.pop('sync_plan_id', None)
+    if old_plan_id and old_plan_id != plan_id:
+        delete_plan(old_plan_id)
+    if plan_id:
+        session['sync_plan_id'] = plan_id
+
+
+def remember_plan(result):
+    """
+    Keep the plan from a dry-run sync; a direct sync makes any pending plan
+    stale, so drop it.
+    """
+    replace_plan(result.get('plan_id'))
+    return result
+
+
+def dry_run_response(planned):
+    """
+    Save a planned change set, remember it in the session and report it.
+    """
+    plan_id = save_plan(planned['plan'])
+    replace_plan(plan_id)
+    return jsonify({
+        'dry_run': True,
+        'summary': summarize_sync_plan(planned['plan']),
+        'plan_id': plan_id,
+        'results': planned['results']
+    })
+
+
+def create_app(config=None):
+    """
+    Application factory. Loads .env, applies `config` and points the
+    mapping/cache stores at MAPPINGS_PATH / ISSUES_CACHE_DIR if set.
+    """
+    from dotenv import load_dotenv
+    from flask_cors import CORS
+
+    load_dotenv()
+
+    # --- Flask app and secret key (required for session) ---
+    app = Flask(__name__)
+    app.secret_key = os.getenv("FLASK_SECRET_KEY") or os.urandom(24)
+    app.config['MAPPINGS_PATH'] = os.getenv("MAPPINGS_PATH")
+    app.config['ISSUES_CACHE_DIR'] = os.getenv("ISSUES_CACHE_DIR")
+    if config:
+        app.config.update(config)
+
+    if app.config.get('MAPPINGS_PATH'):
+        set_mappings_path(app.config['MAPPINGS_PATH'])
+    if app.config.get('ISSUES_CACHE_DIR'):
+        set_cache_dir(app.config['ISSUES_CACHE_DIR'])
+
+    CORS(app)
+    app.register_blueprint(bp)
+    return app
+
+
+@bp.route('/github', methods=['GET'])
 def get_github_page():
     youtrack_url = session.get('youtrack_url')
     permanent_token = session.get('permanent_token')
@@ -33,7 +109,7 @@ def get_github_page():
     )
 
 
-@app.route('/github', methods=['GET', 'POST'])
+@bp.route('/github', methods=['GET', 'POST'])
 def github_page():
     youtrack_url = session.get('youtrack_url')
     permanent_token = session.get('permanent_token')
@@ -63,7 +139,7 @@ def github_page():
                 "Accept": "application/vnd.github+json"
             }
                 
-            response = requests.get(url=github_issue_api, headers=headers)
+            response = get_http().get(url=github_issue_api, headers=headers)
             if response.status_code == 200:
                 issues = response.json()
                 cache_file = save_issues_to_file(issues, repo_url=github)
@@ -93,12 +169,12 @@ def github_page():
     )
 
 
-@app.route('/', methods=['GET'])
+@bp.route('/', methods=['GET'])
 def get_youtrack():
     return render_template('youtrack.html')
 
 
-@app.route('/', methods=['POST'])
+@bp.route('/', methods=['POST'])
 def input_youtrack():
     youtrack_url = request.form.get('youtrack_url', '').strip()
     permanent_token = request.form.get('permanent_token', '').strip()
@@ -115,10 +191,10 @@ def input_youtrack():
     session['youtrack_url'] = youtrack_url
     session['permanent_token'] = permanent_token
     session['youtrack_configured'] = True
-    return redirect(url_for('get_github_page'))
+    return redirect(url_for('main.get_github_page'))
 
 
-@app.route('/import-issue/<int:issue_id>', methods=['POST'])
+@bp.route('/import-issue/<int:issue_id>', methods=['POST'])
 def import_single_issue(issue_id):
     youtrack_url = session.get('youtrack_url')
     permanent_token = session.get('permanent_token')
@@ -126,13 +202,17 @@ def import_single_issue(issue_id):
     issues = load_issues_from_file(cache_file) if cache_file else []
     github_issue = next((issue for issue in issues if issue.get('number') == issue_id), None)
     if github_issue:
-        result = import_one_issue_to_youtrack(youtrack_url, permanent_token, "Imported Issues", github_issue)
+        if is_dry_run():
+            return dry_run_response(plan_import_issues(youtrack_url, YOUTRACK_PROJECT_NAME, [github_issue]))
+        # A direct import makes any pending plan stale
+        replace_plan(None)
+        result = import_one_issue_to_youtrack(youtrack_url, permanent_token, YOUTRACK_PROJECT_NAME, github_issue)
         return jsonify(result)
     else:
         return jsonify({'success': False, 'error': 'Issue not found'}), 404
 
 
-@app.route('/import-bulk-issues', methods=['POST'])
+@bp.route('/import-bulk-issues', methods=['POST'])
 def import_bulk_issues():
     data = request.get_json() or {}
     issue_ids = data.get('issue_ids', [])
@@ -144,9 +224,14 @@ def import_bulk_issues():
 
     selected_issues = [issue for issue in issues if str(issue.get('number')) in issue_ids]
 
+    if is_dry_run():
+        return dry_run_response(plan_import_issues(youtrack_url, YOUTRACK_PROJECT_NAME, selected_issues))
+
+    # A direct import makes any pending plan stale
+    replace_plan(None)
     results = []
     for issue in selected_issues:
-        result = import_one_issue_to_youtrack(youtrack_url, permanent_token, "Imported Issues", issue)
+        result = import_one_issue_to_youtrack(youtrack_url, permanent_token, YOUTRACK_PROJECT_NAME, issue)
         results.append(result)
 
     successful_imports = [r for r in results if r.get('success')]
@@ -156,20 +241,26 @@ def import_bulk_issues():
         'total_count': len(selected_issues),
         'results': results
     })
-@app.route('/session-data')
+@bp.route('/session-data')
 def session_data():
     return jsonify(dict(session))
 
-@app.route('/sync-issues', methods=['POST'])
+@bp.route('/sync-issues', methods=['POST'])
 def sync_issues_endpoint():
     """
     API endpoint to trigger synchronization of all mapped issues.
+    With dry_run, only computes the change set and saves it as a plan.
     """
     try:
-        result = sync_github_to_youtrack()
-        return jsonify(result)
+        result = sync_github_to_youtrack(
+            session.get('youtrack_url'),
+            session.get('permanent_token'),
+            session.get('issues_file'),
+            dry_run=is_dry_run()
+        )
+        return jsonify(remember_plan(result))
     except Exception as e:
-        app.logger.exception("Error in sync_issues_endpoint")
+        current_app.logger.exception("Error in sync_issues_endpoint")
         return jsonify({
             "error": f"Sync failed: {str(e)}",
             "synced": 0,
@@ -177,7 +268,7 @@ def sync_issues_endpoint():
         }), 500
 
 
-@app.route('/sync-issue/<int:github_number>', methods=['POST'])
+@bp.route('/sync-issue/<int:github_number>', methods=['POST'])
 def sync_single_issue_endpoint(github_number):
     """
     API endpoint to sync a single issue by GitHub number.
@@ -192,26 +283,61 @@ def sync_single_issue_endpoint(github_number):
                 "success": False
             }), 404
         
-        # Temporarily modify mappings to sync just this one issue
-        temp_mappings = {str(github_number): youtrack_id}
-        
-        # Store original mappings
-        original_load_mappings = globals()['load_mappings']
-        globals()['load_mappings'] = lambda: temp_mappings
-        
-        try:
-            result = sync_github_to_youtrack()
-            return jsonify(result)
-        finally:
-            # Restore original mappings function
-            globals()['load_mappings'] = original_load_mappings
+        # Sync just this one issue
+        result = sync_github_to_youtrack(
+            session.get('youtrack_url'),
+            session.get('permanent_token'),
+            session.get('issues_file'),
+            mappings={str(github_number): youtrack_id},
+            dry_run=is_dry_run()
+        )
+        return jsonify(remember_plan(result))
             
     except Exception as e:
-        app.logger.exception(f"Error syncing single issue #{github_number}")
+        current_app.logger.exception(f"Error syncing single issue #{github_number}")
         return jsonify({
             "error": f"Sync failed: {str(e)}",
             "success": False
         }), 500
 
+
+@bp.route('/apply-sync-plan', methods=['POST'])
+def apply_sync_plan_endpoint():
+    """
+    API endpoint to apply the last dry-run plan. Only the recorded write
+    requests are sent; nothing is re-fetched.
+    """
+    plan = load_plan(session.get('sync_plan_id'))
+    if not plan:
+        return jsonify({
+            "error": "No sync plan found. Run a dry run first.",
+            "success": False
+        }), 404
+
+    youtrack_url = session.get('youtrack_url')
+    permanent_token = session.get('permanent_token')
+    if not youtrack_url or not permanent_token:
+        return jsonify({"error": "YouTrack credentials not configured", "synced": 0, "errors": 1}), 400
+    if plan.get('youtrack_url') and plan['youtrack_url'] != youtrack_url:
+        return jsonify({
+            "error": "Sync plan was made for a different YouTrack instance",
+            "success": False
+        }), 409
+
+    try:
+        result = apply_sync_plan(youtrack_url, permanent_token, plan)
+        # Keep a plan with failed writes so it can be retried; creates that
+        # went through are skipped on the retry since they are mapped now
+        if not result['errors']:
+            replace_plan(None)
+        return jsonify(result)
+    except Exception as e:
+        current_app.logger.exception("Error applying sync plan")
+        return jsonify({
+            "error": f"Apply failed: {str(e)}",
+            "synced": 0,
+            "errors": 1
+        }), 500
+
 if __name__ == '__main__':
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    create_app().run(debug=True, host='0.0.0.0', port=5000)
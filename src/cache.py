@@ -1,17 +1,31 @@
 from pathlib import Path
+import os
+import re
 import uuid
 
 import json
 
 
+# Resolved lazily so importing this module never touches the filesystem.
+# Override with the ISSUES_CACHE_DIR env var or set_cache_dir().
+_cache_dir = None
+
+def get_cache_dir():
+    global _cache_dir
+    if _cache_dir is None:
+        _cache_dir = Path(os.getenv("ISSUES_CACHE_DIR", "issues_cache"))
+    return _cache_dir
+
+def set_cache_dir(path):
+    global _cache_dir
+    _cache_dir = Path(path)
 
-CACHE_DIR = Path("issues_cache")
-CACHE_DIR.mkdir(parents=True, exist_ok=True)
 # Save issues to a JSON file and return the filename (cache key)
 def save_issues_to_file(issues, repo_url=None):
-
+    cache_dir = get_cache_dir()
+    cache_dir.mkdir(parents=True, exist_ok=True)
     key = f"{uuid.uuid4().hex}.json"
-    file_path = CACHE_DIR / key
+    file_path = cache_dir / key
     with open(file_path, "w", encoding="utf-8") as f:
         json.dump(issues, f, indent=2)
     return str(file_path)
@@ -21,4 +35,33 @@ def load_issues_from_file(path):
         with open(path, "r", encoding="utf-8") as f:
             return json.load(f)
     except Exception:
-        return []
\ No newline at end of file
+        return []
+
+# Plans are stored in the cache dir and referred to only by their id (file name)
+PLAN_ID_RE = re.compile(r"plan-[0-9a-f]{32}\.json")
+
+# Save a sync/import plan as a compact JSON artifact and return its id
+def save_plan(plan):
+    cache_dir = get_cache_dir()
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    plan_id = f"plan-{uuid.uuid4().hex}.json"
+    with open(cache_dir / plan_id, "w", encoding="utf-8") as f:
+        json.dump(plan, f, separators=(",", ":"))
+    return plan_id
+#Load a plan back by id; None if the id is invalid or the plan is gone.
+def load_plan(plan_id):
+    if not plan_id or not PLAN_ID_RE.fullmatch(plan_id):
+        return None
+    try:
+        with open(get_cache_dir() / plan_id, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return None
+#Delete a plan by id; invalid ids and missing files are ignored.
+def delete_plan(plan_id):
+    if not plan_id or not PLAN_ID_RE.fullmatch(plan_id):
+        return
+    try:
+        (get_cache_dir() / plan_id).unlink()
+    except FileNotFoundError:
+        pass
@@ -1,21 +1,37 @@
 from pathlib import Path
+import os
 
 import json
 
 # mapping GH issue number -> YouTrack id
-MAPPINGS_PATH = Path("mappings.json")
-if not MAPPINGS_PATH.exists():
-    MAPPINGS_PATH.write_text(json.dumps({}), encoding="utf-8")
+# Resolved lazily so importing this module never touches the filesystem.
+# Override with the MAPPINGS_PATH env var or set_mappings_path().
+_mappings_path = None
+
+def get_mappings_path():
+    global _mappings_path
+    if _mappings_path is None:
+        _mappings_path = Path(os.getenv("MAPPINGS_PATH", "mappings.json"))
+    return _mappings_path
+
+def set_mappings_path(path):
+    global _mappings_path
+    _mappings_path = Path(path)
 
 def load_mappings():
+    path = get_mappings_path()
+    if not path.exists():
+        return {}
     try:
-        return json.loads(MAPPINGS_PATH.read_text(encoding="utf-8") or "{}")
+        return json.loads(path.read_text(encoding="utf-8") or "{}")
     except Exception:
         return {}
 
 def save_mappings(m):
     try:
-        MAPPINGS_PATH.write_text(json.dumps(m, indent=2), encoding="utf-8")
+        path = get_mappings_path()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(m, indent=2), encoding="utf-8")
     except Exception:
         pass
 
@@ -31,4 +47,4 @@ def remove_mapping(github_number: int):
     m = load_mappings()
     if str(github_number) in m:
         m.pop(str(github_number))
-        save_mappings(m)
\ No newline at end of file
+        save_mappings(m)
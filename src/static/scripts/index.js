@@ -242,9 +242,8 @@ function checkSyncStatus() {
   btn.disabled = true;
   results.innerHTML = "<p>Checking sync status...</p>";
 
-  // This would need a new endpoint to check status without syncing
-  // For now, we'll use the sync endpoint but show status only
-  fetch("/sync-issues", {
+  // Dry run: computes the change set without writing to YouTrack
+  fetch("/sync-issues?dry_run=1", {
     method: "POST",
     headers: {
       "Content-Type": "application/json",
@@ -1,13 +1,31 @@
-from flask import session
-from dateutil import parser
-
+import logging
 import os
-import requests
+import threading
 import time
 
-from cache import load_issues_from_file
-from mapping import *
-from app import app
+from cache import load_issues_from_file, save_plan
+from mapping import add_mapping, load_mappings
+
+logger = logging.getLogger(__name__)
+
+# requests and dateutil are imported on first use so workers and CLI jobs
+# that only touch mappings/cache don't pay for them at startup.
+_local = threading.local()
+
+def get_http():
+    """
+    Return this thread's requests.Session, creating it on first use.
+    Sessions are per thread because requests.Session isn't thread-safe, and
+    they reject all cookies so one user's YouTrack cookies never reach another.
+    """
+    http = getattr(_local, 'http', None)
+    if http is None:
+        from http.cookiejar import DefaultCookiePolicy
+        import requests
+        http = requests.Session()
+        http.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        _local.http = http
+    return http
 
 
 # I kept these fields since other fields needs to be added first on youtrack's server to properly work
@@ -49,246 +67,492 @@ def convert_github_to_youtrack(project_name, issue_title, issue_body, issue_stat
     }
     return body
 
-def sync_github_to_youtrack():
-    """
-    For every mapping in mappings.json, query both GitHub and YouTrack issues
-    and update YouTrack if the GitHub issue is newer.
-    """
-    mappings = load_mappings()
-    if not mappings:
-        app.logger.info("No mappings found to sync")
-        return {"synced": 0, "errors": 0, "results": []}
-    
-    results = []
-    synced_count = 0
-    error_count = 0
-    
-    # Get session data for YouTrack connection
-    youtrack_url = session.get('youtrack_url')
-    permanent_token = session.get('permanent_token')
-    
-    if not youtrack_url or not permanent_token:
-        app.logger.error("YouTrack credentials not found in session")
-        return {"error": "YouTrack credentials not configured", "synced": 0, "errors": 1}
-    
-    # Get GitHub token
+YOUTRACK_PROJECT_NAME = "Imported Issues"
+
+YOUTRACK_ISSUE_FIELDS = "id,summary,description,updated,customFields(name,value(name))"
+
+# Map GitHub states to YouTrack states
+STATE_MAPPING = {
+    'open': 'Open',
+    'closed': 'Fixed'  # You might want to adjust this mapping
+}
+
+
+def _github_headers():
     github_token = os.getenv("GITHUB_TOKEN")
-    github_headers = {
+    headers = {
         "Accept": "application/vnd.github+json",
         "X-GitHub-Api-Version": "2022-11-28"
     }
     if github_token:
-        github_headers["Authorization"] = f"token {github_token}"
-    
-    # YouTrack headers
-    youtrack_headers = {
+        headers["Authorization"] = f"token {github_token}"
+    return headers
+
+
+def _youtrack_headers(permanent_token):
+    return {
         'Accept': 'application/json',
         'Authorization': f'Bearer {permanent_token}',
         'Content-Type': 'application/json'
     }
-    
+
+
+def fetch_github_issues_bulk(repo_url, numbers):
+    """
+    Fetch the given issue numbers from one repository using the paginated
+    list endpoint instead of one request per issue.
+    Listing stops once it has cost as many requests as the issues still
+    missing would; those are then fetched individually.
+    Returns ({number: issue}, {number: status_code}) for found and failed issues.
+    """
+    http = get_http()
+    headers = _github_headers()
+    missing = set(numbers)
+    found = {}
+    failures = {}
+    pages = 0
+    while len(missing) > pages + 1:
+        pages += 1
+        response = http.get(
+            f"{repo_url}/issues",
+            headers=headers,
+            params={"state": "all", "sort": "updated", "direction": "desc", "per_page": 100, "page": pages},
+            timeout=10
+        )
+        if response.status_code != 200:
+            logger.error(f"Failed to list GitHub issues for {repo_url}: {response.status_code}")
+            break
+        batch = response.json()
+        for issue in batch:
+            if issue.get('number') in missing:
+                found[issue['number']] = issue
+                missing.discard(issue['number'])
+        if len(batch) < 100:
+            break
+
+    for number in missing:
+        response = http.get(f"{repo_url}/issues/{number}", headers=headers, timeout=10)
+        if response.status_code == 200:
+            found[number] = response.json()
+        else:
+            logger.error(f"Failed to fetch GitHub issue #{number}: {response.status_code}")
+            failures[number] = response.status_code
+    return found, failures
+
+
+def fetch_youtrack_issues_bulk(youtrack_url, permanent_token, youtrack_ids):
+    """
+    Fetch the given YouTrack issues by paging through the import project.
+    Listing stops once it has cost as many requests as the issues still
+    missing would; those are then fetched individually.
+    Returns ({id: issue}, {id: status_code}) for found and failed issues.
+    """
+    http = get_http()
+    headers = _youtrack_headers(permanent_token)
+    base_url = f"{youtrack_url.rstrip('/')}/api/issues"
+    missing = set(youtrack_ids)
+    found = {}
+    failures = {}
+    pages = 0
+    while len(missing) > pages + 1:
+        response = http.get(
+            base_url,
+            headers=headers,
+            params={
+                "fields": YOUTRACK_ISSUE_FIELDS,
+                "query": f"project: {{{YOUTRACK_PROJECT_NAME}}}",
+                "$top": 100,
+                "$skip": pages * 100
+            },
+            timeout=10
+        )
+        pages += 1
+        if response.status_code != 200:
+            logger.error(f"Failed to list YouTrack issues in {YOUTRACK_PROJECT_NAME}: {response.status_code}")
+            break
+        batch = response.json()
+        for issue in batch:
+            if issue.get('id') in missing:
+                found[issue['id']] = issue
+                missing.discard(issue['id'])
+        if len(batch) < 100:
+            break
+
+    for youtrack_id in missing:
+        response = http.get(
+            f"{base_url}/{youtrack_id}",
+            headers=headers,
+            params={"fields": YOUTRACK_ISSUE_FIELDS},
+            timeout=10
+        )
+        if response.status_code == 200:
+            found[youtrack_id] = response.json()
+        else:
+            logger.error(f"Failed to fetch YouTrack issue {youtrack_id}: {response.status_code}")
+            failures[youtrack_id] = response.status_code
+    return found, failures
+
+
+def compute_youtrack_updates(github_issue, youtrack_issue):
+    """
+    Compare a GitHub issue with its YouTrack counterpart.
+    Returns (updates, transition): the POST body with only the changed fields,
+    and a (from_state, to_state) tuple if the state changes, else None.
+    """
+    updates = {}
+
+    # Check if summary needs updating
+    github_title = github_issue.get('title', '')
+    youtrack_summary = youtrack_issue.get('summary', '')
+    if github_title != youtrack_summary:
+        updates['summary'] = github_title
+
+    # Check if description needs updating
+    github_body = github_issue.get('body') or "No description provided"
+    youtrack_description = youtrack_issue.get('description', '')
+    if github_body != youtrack_description:
+        updates['description'] = github_body
+
+    # Check if state needs updating
+    github_state = github_issue.get('state', 'open')
+    youtrack_state_name = None
+
+    # Find current state in YouTrack custom fields
+    custom_fields = youtrack_issue.get('customFields', [])
+    state_field = next((cf for cf in custom_fields if cf.get('name') == 'State'), None)
+    if state_field and state_field.get('value'):
+        youtrack_state_name = state_field['value'].get('name', '')
+
+    transition = None
+    expected_state = STATE_MAPPING.get(github_state.lower(), 'Open')
+    if (youtrack_state_name or '').lower() != expected_state.lower():
+        transition = (youtrack_state_name, expected_state)
+        updates['customFields'] = [{
+            "value": {
+                "name": expected_state,
+                "$type": "StateBundleElement"
+            },
+            "name": "State",
+            "$type": "StateIssueCustomField"
+        }]
+
+    return updates, transition
+
+
+def plan_github_to_youtrack(youtrack_url, permanent_token, issues_file=None, mappings=None):
+    """
+    Plan phase of the sync: bulk-fetch both sides for every mapping and
+    compute the change set without writing anything to YouTrack.
+    `issues_file` is the cached GitHub issue list used to find each repository.
+    Returns {"plan": ..., "results": [...], "errors": n} or {"error": ...}.
+    """
+    from dateutil import parser
+
+    if mappings is None:
+        mappings = load_mappings()
+
+    if not youtrack_url or not permanent_token:
+        logger.error("YouTrack credentials not configured")
+        return {"error": "YouTrack credentials not configured", "synced": 0, "errors": 1}
+
+    plan = new_sync_plan(youtrack_url)
+    results = []
+    error_count = 0
+
+    # Get cached issues to find the repository info
+    cached_issues = load_issues_from_file(issues_file) if issues_file else []
+    cached_by_number = {issue.get('number'): issue for issue in cached_issues}
+
+    # Group mapped issues by repository so each side is fetched in bulk
+    numbers_by_repo = {}
     for github_number_str, youtrack_id in mappings.items():
         try:
             github_number = int(github_number_str)
-            
-            # Get cached issues to find the repository info
-            cache_file = session.get('issues_file')
-            cached_issues = load_issues_from_file(cache_file) if cache_file else []
-            
-            # Find the cached issue to get repository info
-            cached_issue = next((issue for issue in cached_issues if issue.get('number') == github_number), None)
-            if not cached_issue:
-                app.logger.warning(f"No cached issue found for GitHub #{github_number}")
-                continue
-            
-            # Extract repository info from the cached issue URL
-            repo_url = cached_issue.get('repository_url', '')
-            if not repo_url:
-                app.logger.warning(f"No repository URL found for GitHub #{github_number}")
-                continue
-            
-            # Query GitHub API for current issue state
-            github_api_url = f"{repo_url}/issues/{github_number}"
-            github_response = requests.get(github_api_url, headers=github_headers, timeout=10)
-            
-            if github_response.status_code != 200:
-                app.logger.error(f"Failed to fetch GitHub issue #{github_number}: {github_response.status_code}")
-                error_count += 1
-                results.append({
-                    "github_number": github_number,
-                    "youtrack_id": youtrack_id,
-                    "status": "error",
-                    "message": f"Failed to fetch GitHub issue: {github_response.status_code}"
-                })
-                continue
-            
-            github_issue = github_response.json()
-            
-            # Query YouTrack API for current issue state
-            youtrack_api_url = f"{youtrack_url.rstrip('/')}/api/issues/{youtrack_id}"
-            youtrack_params = {
-                "fields": "id,summary,description,updated,customFields(name,value(name))"
-            }
-            youtrack_response = requests.get(
-                youtrack_api_url, 
-                headers=youtrack_headers, 
-                params=youtrack_params,
-                timeout=10
-            )
-            
-            if youtrack_response.status_code != 200:
-                app.logger.error(f"Failed to fetch YouTrack issue {youtrack_id}: {youtrack_response.status_code}")
-                error_count += 1
-                results.append({
-                    "github_number": github_number,
-                    "youtrack_id": youtrack_id,
-                    "status": "error",
-                    "message": f"Failed to fetch YouTrack issue: {youtrack_response.status_code}"
-                })
-                continue
-            
-            youtrack_issue = youtrack_response.json()
-            
-            # Compare timestamps
-            github_updated_str = github_issue.get('updated_at')
-            youtrack_updated = youtrack_issue.get('updated')  # Unix timestamp in milliseconds
-            
-            if not github_updated_str or not youtrack_updated:
-                app.logger.warning(f"Missing timestamp data for GitHub #{github_number} or YouTrack {youtrack_id}")
-                continue
-            
-            # Parse GitHub timestamp (ISO 8601 format)
-            github_updated = parser.parse(github_updated_str)
-            github_updated_timestamp = int(github_updated.timestamp() * 1000)  # Convert to milliseconds
-            
-            # Compare timestamps
-            if github_updated_timestamp > youtrack_updated:
-                app.logger.info(f"GitHub issue #{github_number} is newer, updating YouTrack {youtrack_id}")
-                
-                # Update YouTrack issue
-                update_result = update_youtrack_issue_from_github(
-                    youtrack_url, 
-                    permanent_token, 
-                    youtrack_id, 
-                    github_issue,
-                    youtrack_issue
-                )
-                
-                if update_result['success']:
-                    synced_count += 1
+        except (TypeError, ValueError):
+            logger.warning(f"Invalid GitHub issue number in mappings: {github_number_str!r}")
+            error_count += 1
+            results.append({
+                "github_number": github_number_str,
+                "youtrack_id": youtrack_id,
+                "status": "error",
+                "message": f"Invalid GitHub issue number: {github_number_str!r}"
+            })
+            continue
+        cached_issue = cached_by_number.get(github_number)
+        if not cached_issue:
+            logger.warning(f"No cached issue found for GitHub #{github_number}")
+            continue
+        repo_url = cached_issue.get('repository_url', '')
+        if not repo_url:
+            logger.warning(f"No repository URL found for GitHub #{github_number}")
+            continue
+        numbers_by_repo.setdefault(repo_url, []).append(github_number)
+
+    github_issues = {}
+    github_failures = {}
+    for repo_url, numbers in numbers_by_repo.items():
+        found, failures = fetch_github_issues_bulk(repo_url, numbers)
+        github_issues.update(found)
+        github_failures.update(failures)
+    youtrack_ids = [mappings[str(n)] for numbers in numbers_by_repo.values() for n in numbers]
+    youtrack_issues, youtrack_failures = fetch_youtrack_issues_bulk(youtrack_url, permanent_token, youtrack_ids)
+
+    for numbers in numbers_by_repo.values():
+        for github_number in numbers:
+            youtrack_id = mappings[str(github_number)]
+            try:
+                github_issue = github_issues.get(github_number)
+                if github_issue is None:
+                    error_count += 1
+                    results.append({
+                        "github_number": github_number,
+                        "youtrack_id": youtrack_id,
+                        "status": "error",
+                        "message": f"Failed to fetch GitHub issue: {github_failures.get(github_number)}"
+                    })
+                    continue
+
+                youtrack_issue = youtrack_issues.get(youtrack_id)
+                if youtrack_issue is None:
+                    error_count += 1
                     results.append({
                         "github_number": github_number,
                         "youtrack_id": youtrack_id,
-                        "status": "updated",
-                        "message": "Successfully updated from GitHub",
+                        "status": "error",
+                        "message": f"Failed to fetch YouTrack issue: {youtrack_failures.get(youtrack_id)}"
+                    })
+                    continue
+
+                # Compare timestamps
+                github_updated_str = github_issue.get('updated_at')
+                youtrack_updated = youtrack_issue.get('updated')  # Unix timestamp in milliseconds
+
+                if not github_updated_str or not youtrack_updated:
+                    logger.warning(f"Missing timestamp data for GitHub #{github_number} or YouTrack {youtrack_id}")
+                    continue
+
+                # Parse GitHub timestamp (ISO 8601 format)
+                github_updated = parser.parse(github_updated_str)
+                github_updated_timestamp = int(github_updated.timestamp() * 1000)  # Convert to milliseconds
+
+                updates, transition = None, None
+                if github_updated_timestamp > youtrack_updated:
+                    updates, transition = compute_youtrack_updates(github_issue, youtrack_issue)
+
+                if updates:
+                    op = {
+                        "op": "update",
+                        "github_number": github_number,
+                        "youtrack_id": youtrack_id,
+                        "body": updates
+                    }
+                    if transition:
+                        op["transition"] = list(transition)
+                    plan["ops"].append(op)
+                    results.append({
+                        "github_number": github_number,
+                        "youtrack_id": youtrack_id,
+                        "status": "needs_update",
+                        "message": f"Would update fields: {', '.join(updates.keys())}",
                         "github_updated": github_updated_str,
                         "youtrack_updated": youtrack_updated
                     })
                 else:
-                    error_count += 1
                     results.append({
                         "github_number": github_number,
                         "youtrack_id": youtrack_id,
-                        "status": "error",
-                        "message": f"Failed to update: {update_result.get('error', 'Unknown error')}"
+                        "status": "up_to_date",
+                        "message": "YouTrack issue is up to date"
                     })
-            else:
+
+            except Exception as e:
+                logger.exception(f"Error planning GitHub #{github_number} -> YouTrack {youtrack_id}")
+                error_count += 1
                 results.append({
                     "github_number": github_number,
                     "youtrack_id": youtrack_id,
-                    "status": "up_to_date",
-                    "message": "YouTrack issue is up to date"
+                    "status": "error",
+                    "message": f"Exception: {str(e)}"
                 })
-                
-        except Exception as e:
-            app.logger.exception(f"Error syncing GitHub #{github_number_str} -> YouTrack {youtrack_id}")
-            error_count += 1
+
+    return {"plan": plan, "results": results, "errors": error_count}
+
+
+def plan_import_issues(youtrack_url, project_name, github_issues):
+    """
+    Plan phase of an import: build the create requests for the given GitHub
+    issues, skipping ones that are already mapped. Nothing is written.
+    Returns {"plan": ..., "results": [...]}.
+    """
+    mappings = load_mappings()
+    plan = new_sync_plan(youtrack_url)
+    results = []
+    for github_issue in github_issues:
+        gh_number = github_issue.get('number')
+        if str(gh_number) in mappings:
             results.append({
-                "github_number": github_number_str,
-                "youtrack_id": youtrack_id,
-                "status": "error", 
-                "message": f"Exception: {str(e)}"
+                'issue_id': gh_number,
+                'youtrack_id': mappings[str(gh_number)],
+                'status': 'already_imported',
+                'message': f"Issue #{gh_number} is already imported"
             })
-        
-        # Add delay to respect API rate limits
-        time.sleep(0.5)
-    
+            continue
+        plan["ops"].append({
+            "op": "create",
+            "github_number": gh_number,
+            "body": convert_github_to_youtrack(
+                project_name=project_name,
+                issue_title=github_issue.get('title'),
+                issue_body=github_issue.get('body'),
+                issue_state=github_issue.get('state')
+            )
+        })
+        results.append({
+            'issue_id': gh_number,
+            'status': 'needs_create',
+            'message': f"Issue #{gh_number} would be imported"
+        })
+    return {"plan": plan, "results": results}
+
+
+def new_sync_plan(youtrack_url):
+    return {
+        "version": 1,
+        "created_at": int(time.time() * 1000),
+        "youtrack_url": youtrack_url,
+        "ops": []
+    }
+
+
+def summarize_sync_plan(plan):
+    """
+    Count the creates, field updates and state transitions in a plan.
+    """
+    ops = plan.get("ops", [])
+    return {
+        "creates": sum(1 for op in ops if op["op"] == "create"),
+        "updates": sum(1 for op in ops if op["op"] == "update"),
+        "transitions": sum(1 for op in ops if op.get("transition"))
+    }
+
+
+def apply_sync_plan(youtrack_url, permanent_token, plan):
+    """
+    Apply phase: send only the write requests recorded in a plan.
+    Nothing is re-fetched from GitHub or YouTrack; creates for issues that
+    have been mapped since the plan was made are skipped.
+    """
+    results = []
+    synced_count = 0
+    error_count = 0
+    mappings = load_mappings()
+
+    for op in plan.get("ops", []):
+        github_number = op.get("github_number")
+        if op["op"] == "create" and str(github_number) in mappings:
+            results.append({
+                "github_number": github_number,
+                "youtrack_id": mappings[str(github_number)],
+                "status": "already_imported",
+                "message": f"Issue #{github_number} is already imported"
+            })
+        elif op["op"] == "create":
+            result = create_youtrack_issue(youtrack_url, permanent_token, op["body"], github_number)
+            if result['success']:
+                synced_count += 1
+                results.append({
+                    "github_number": github_number,
+                    "youtrack_id": result.get('youtrack_id'),
+                    "status": "created",
+                    "message": result['message']
+                })
+            else:
+                error_count += 1
+                results.append({
+                    "github_number": github_number,
+                    "status": "error",
+                    "message": f"Failed to create: {result.get('error', 'Unknown error')}"
+                })
+        else:
+            youtrack_id = op["youtrack_id"]
+            result = post_youtrack_updates(youtrack_url, permanent_token, youtrack_id, op["body"])
+            if result['success']:
+                synced_count += 1
+                results.append({
+                    "github_number": github_number,
+                    "youtrack_id": youtrack_id,
+                    "status": "updated",
+                    "message": "Successfully updated from GitHub"
+                })
+            else:
+                error_count += 1
+                results.append({
+                    "github_number": github_number,
+                    "youtrack_id": youtrack_id,
+                    "status": "error",
+                    "message": f"Failed to update: {result.get('error', 'Unknown error')}"
+                })
+
     return {
         "synced": synced_count,
         "errors": error_count,
+        "total_checked": len(plan.get("ops", [])),
+        "results": results
+    }
+
+
+def sync_github_to_youtrack(youtrack_url, permanent_token, issues_file=None, mappings=None, dry_run=False):
+    """
+    For every mapping in mappings.json, query both GitHub and YouTrack issues
+    and update YouTrack if the GitHub issue is newer.
+    Pass `mappings` to restrict the sync to a subset of issues.
+    With `dry_run` nothing is written; the change set is saved as a plan
+    (see cache.save_plan) that apply_sync_plan() can replay later.
+    """
+    if mappings is None:
+        mappings = load_mappings()
+    if not mappings:
+        logger.info("No mappings found to sync")
+        return {"synced": 0, "errors": 0, "results": []}
+
+    planned = plan_github_to_youtrack(youtrack_url, permanent_token, issues_file, mappings)
+    if "error" in planned:
+        return planned
+    plan = planned["plan"]
+    planned_results = planned["results"]
+
+    if dry_run:
+        return {
+            "dry_run": True,
+            "synced": 0,
+            "errors": planned["errors"],
+            "total_checked": len(mappings),
+            "summary": summarize_sync_plan(plan),
+            "plan_id": save_plan(plan),
+            "results": planned_results
+        }
+
+    applied = apply_sync_plan(youtrack_url, permanent_token, plan)
+    # Keep planned details such as github_updated, with the applied status on top
+    applied_by_number = {r["github_number"]: r for r in applied["results"]}
+    results = [{**r, **applied_by_number.get(r["github_number"], {})} for r in planned_results]
+
+    return {
+        "synced": applied["synced"],
+        "errors": planned["errors"] + applied["errors"],
         "total_checked": len(mappings),
         "results": results
     }
 
 
-def update_youtrack_issue_from_github(youtrack_url, permanent_token, youtrack_id, github_issue, youtrack_issue):
+def post_youtrack_updates(youtrack_url, permanent_token, youtrack_id, updates):
     """
-    Update a YouTrack issue with data from a GitHub issue.
-    Only updates fields that have actually changed.
+    POST a precomputed field update to a YouTrack issue.
     """
     try:
-        updates = {}
-        
-        # Check if summary needs updating
-        github_title = github_issue.get('title', '')
-        youtrack_summary = youtrack_issue.get('summary', '')
-        if github_title != youtrack_summary:
-            updates['summary'] = github_title
-        
-        # Check if description needs updating
-        github_body = github_issue.get('body') or "No description provided"
-        youtrack_description = youtrack_issue.get('description', '')
-        if github_body != youtrack_description:
-            updates['description'] = github_body
-        
-        # Check if state needs updating
-        github_state = github_issue.get('state', 'open')
-        youtrack_state_name = None
-        
-        # Find current state in YouTrack custom fields
-        custom_fields = youtrack_issue.get('customFields', [])
-        state_field = next((cf for cf in custom_fields if cf.get('name') == 'State'), None)
-        if state_field and state_field.get('value'):
-            youtrack_state_name = state_field['value'].get('name', '').lower()
-        
-        # Map GitHub states to YouTrack states
-        state_mapping = {
-            'open': 'Open',
-            'closed': 'Fixed'  # You might want to adjust this mapping
-        }
-        
-        expected_state = state_mapping.get(github_state.lower(), 'Open')
-        if youtrack_state_name != expected_state.lower():
-            if 'customFields' not in updates:
-                updates['customFields'] = []
-            
-            updates['customFields'].append({
-                "value": {
-                    "name": expected_state,
-                    "$type": "StateBundleElement"
-                },
-                "name": "State",
-                "$type": "StateIssueCustomField"
-            })
-        
-        # If no updates needed, return success
-        if not updates:
-            return {
-                'success': True,
-                'message': 'No updates needed',
-                'updated_fields': []
-            }
-        
-        # Perform the update
-        headers = {
-            'Accept': 'application/json',
-            'Authorization': f'Bearer {permanent_token}',
-            'Content-Type': 'application/json'
-        }
-        
         url = f"{youtrack_url.rstrip('/')}/api/issues/{youtrack_id}"
-        response = requests.post(url, headers=headers, json=updates, timeout=15)
-        
+        response = get_http().post(url, headers=_youtrack_headers(permanent_token), json=updates, timeout=15)
+
         if response.status_code in (200, 201):
             return {
                 'success': True,
@@ -300,7 +564,7 @@ def update_youtrack_issue_from_github(youtrack_url, permanent_token, youtrack_id
                 'success': False,
                 'error': f"YouTrack API error: {response.status_code} - {response.text}"
             }
-            
+
     except Exception as e:
         return {
             'success': False,
@@ -308,8 +572,6 @@ def update_youtrack_issue_from_github(youtrack_url, permanent_token, youtrack_id
         }
 
 
-
-
 def build_api_url_from_input(raw_url: str) -> str:
     """
     Simple GitHub URL to API URL converter
@@ -353,14 +615,16 @@ def import_one_issue_to_youtrack(youtrack_url, permanent_token, project_name, gi
         issue_body=github_issue.get('body'),
         issue_state=github_issue.get('state')
     )
-    headers = {
-        'Accept': 'application/json',
-        'Authorization': f'Bearer {permanent_token}',
-        'Content-Type': 'application/json'
-    }
+    return create_youtrack_issue(youtrack_url, permanent_token, youtrack_issue, github_issue.get('number'))
+
+
+def create_youtrack_issue(youtrack_url, permanent_token, youtrack_issue, gh_number):
+    """
+    POST a converted issue to YouTrack and record the GH -> YT mapping.
+    """
     url = youtrack_url.rstrip("/") + "/api/issues"
     try:
-        response = requests.post(url, headers=headers, json=youtrack_issue)
+        response = get_http().post(url, headers=_youtrack_headers(permanent_token), json=youtrack_issue)
         if response.status_code in (200, 201):
             yt_id = None
             try:
@@ -369,32 +633,31 @@ def import_one_issue_to_youtrack(youtrack_url, permanent_token, project_name, gi
                 pass
 
             # save mapping (if we got an id)
-            gh_number = github_issue.get('number')
             if gh_number and yt_id:
                 try:
                     add_mapping(gh_number, yt_id)
                 except Exception:
-                    app.logger.exception("Failed to add mapping for GH %s -> YT %s", gh_number, yt_id)            
+                    logger.exception("Failed to add mapping for GH %s -> YT %s", gh_number, yt_id)
             return {
                 'success': True,
-                'issue_id': github_issue.get('number'),
-                'youtrack_id': response.json().get('id'),
-                'message': f"Issue #{github_issue.get('number')} imported successfully"
+                'issue_id': gh_number,
+                'youtrack_id': yt_id,
+                'message': f"Issue #{gh_number} imported successfully"
             }
         else:
             return {
                 'success': False,
-                'issue_id': github_issue.get('number'),
+                'issue_id': gh_number,
                 'error': f"YouTrack API error: {response.status_code} - {response.text}",
-                'message': f"Failed to import issue #{github_issue.get('number')}"
+                'message': f"Failed to import issue #{gh_number}"
             }
 
     except Exception as e:
         return {
             'success': False,
-            'issue_id': github_issue.get('number'),
+            'issue_id': gh_number,
             'error': str(e),
-            'message': f"Error importing issue #{github_issue.get('number')}"
+            'message': f"Error importing issue #{gh_number}"
         }
 
 
@@ -0,0 +1,62 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+import cache
+import mapping
+import sync
+
+
+class StubResponse:
+    def __init__(self, status_code, data=None):
+        self.status_code = status_code
+        self._data = data
+        self.text = ""
+
+    def json(self):
+        return self._data
+
+
+class StubHttp:
+    """
+    Stands in for the requests.Session returned by sync.get_http().
+    `routes` maps a URL to a StubResponse (or a callable taking the params);
+    unknown URLs get a 404. Every call is recorded in `calls`.
+    """
+
+    def __init__(self, routes=None):
+        self.routes = routes or {}
+        self.calls = []
+
+    def _respond(self, method, url, params=None, json=None):
+        self.calls.append((method, url, params, json))
+        route = self.routes.get((method, url))
+        if callable(route):
+            return route(params)
+        return route or StubResponse(404)
+
+    def get(self, url, params=None, **kwargs):
+        return self._respond("GET", url, params=params)
+
+    def post(self, url, json=None, **kwargs):
+        return self._respond("POST", url, json=json)
+
+    def requests(self, method):
+        return [call for call in self.calls if call[0] == method]
+
+
+@pytest.fixture(autouse=True)
+def data_paths(tmp_path):
+    mapping.set_mappings_path(tmp_path / "mappings.json")
+    cache.set_cache_dir(tmp_path / "issues_cache")
+    return tmp_path
+
+
+@pytest.fixture
+def http(monkeypatch):
+    stub = StubHttp()
+    monkeypatch.setattr(sync, "get_http", lambda: stub)
+    return stub
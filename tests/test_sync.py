@@ -0,0 +1,146 @@
+from conftest import StubResponse
+
+import cache
+import mapping
+import sync
+
+YOUTRACK_URL = "https://yt.example.com"
+TOKEN = "perm-test"
+REPO_URL = "https://api.github.com/repos/owner/repo"
+
+
+def github_issue(number, title="Title", state="open", updated_at="2030-01-01T00:00:00Z"):
+    return {
+        "number": number,
+        "title": title,
+        "body": "Body",
+        "state": state,
+        "updated_at": updated_at,
+        "repository_url": REPO_URL,
+    }
+
+
+def youtrack_issue(youtrack_id, summary="Title", state="Open", updated=1000):
+    return {
+        "id": youtrack_id,
+        "summary": summary,
+        "description": "Body",
+        "updated": updated,
+        "customFields": [{"name": "State", "value": {"name": state}}],
+    }
+
+
+def setup_mapped_issue(http, number=1, youtrack_id="2-1", **github_fields):
+    issue = github_issue(number, **github_fields)
+    mapping.add_mapping(number, youtrack_id)
+    http.routes[("GET", f"{REPO_URL}/issues/{number}")] = StubResponse(200, issue)
+    http.routes[("GET", f"{YOUTRACK_URL}/api/issues/{youtrack_id}")] = StubResponse(200, youtrack_issue(youtrack_id, summary="Old title"))
+    http.routes[("POST", f"{YOUTRACK_URL}/api/issues/{youtrack_id}")] = StubResponse(200, {"id": youtrack_id})
+    return cache.save_issues_to_file([issue])
+
+
+def test_dry_run_sends_no_writes(http):
+    issues_file = setup_mapped_issue(http, state="closed")
+
+    result = sync.sync_github_to_youtrack(YOUTRACK_URL, TOKEN, issues_file, dry_run=True)
+
+    assert http.requests("POST") == []
+    assert result["summary"] == {"creates": 0, "updates": 1, "transitions": 1}
+    assert result["results"][0]["status"] == "needs_update"
+    plan = cache.load_plan(result["plan_id"])
+    assert plan["ops"][0]["body"]["summary"] == "Title"
+    assert plan["ops"][0]["transition"] == ["Open", "Fixed"]
+
+
+def test_apply_sends_only_recorded_writes(http):
+    issues_file = setup_mapped_issue(http)
+    plan = cache.load_plan(sync.sync_github_to_youtrack(YOUTRACK_URL, TOKEN, issues_file, dry_run=True)["plan_id"])
+    http.calls.clear()
+
+    result = sync.apply_sync_plan(YOUTRACK_URL, TOKEN, plan)
+
+    assert http.requests("GET") == []
+    assert [(url, body) for _, url, _, body in http.calls] == [
+        (f"{YOUTRACK_URL}/api/issues/2-1", {"summary": "Title"})
+    ]
+    assert result["synced"] == 1
+    assert result["results"][0]["status"] == "updated"
+
+
+def test_apply_skips_create_for_already_mapped_issue(http):
+    http.routes[("POST", f"{YOUTRACK_URL}/api/issues")] = StubResponse(200, {"id": "2-7"})
+    plan = sync.plan_import_issues(YOUTRACK_URL, sync.YOUTRACK_PROJECT_NAME, [github_issue(7)])["plan"]
+    sync.import_one_issue_to_youtrack(YOUTRACK_URL, TOKEN, sync.YOUTRACK_PROJECT_NAME, github_issue(7))
+    http.calls.clear()
+
+    result = sync.apply_sync_plan(YOUTRACK_URL, TOKEN, plan)
+
+    assert http.calls == []
+    assert result["results"][0]["status"] == "already_imported"
+    assert mapping.load_mappings() == {"7": "2-7"}
+
+
+def test_plan_import_skips_mapped_issues():
+    mapping.add_mapping(1, "2-1")
+
+    planned = sync.plan_import_issues(YOUTRACK_URL, sync.YOUTRACK_PROJECT_NAME, [github_issue(1), github_issue(2)])
+
+    assert [op["github_number"] for op in planned["plan"]["ops"]] == [2]
+    assert [r["status"] for r in planned["results"]] == ["already_imported", "needs_create"]
+
+
+def test_github_listing_falls_back_to_per_issue_requests(http):
+    # Listing only returns issue 3; 1 and 2 must be fetched individually
+    http.routes[("GET", f"{REPO_URL}/issues")] = lambda params: StubResponse(200, [github_issue(3)])
+    http.routes[("GET", f"{REPO_URL}/issues/1")] = StubResponse(200, github_issue(1))
+    http.routes[("GET", f"{REPO_URL}/issues/2")] = StubResponse(404)
+
+    found, failures = sync.fetch_github_issues_bulk(REPO_URL, [1, 2, 3])
+
+    assert sorted(found) == [1, 3]
+    assert failures == {2: 404}
+    assert [url for _, url, _, _ in http.calls].count(f"{REPO_URL}/issues") == 1
+
+
+def test_single_issue_skips_listing(http):
+    http.routes[("GET", f"{REPO_URL}/issues/1")] = StubResponse(200, github_issue(1))
+    http.routes[("GET", f"{YOUTRACK_URL}/api/issues/2-1")] = StubResponse(200, youtrack_issue("2-1"))
+
+    sync.fetch_github_issues_bulk(REPO_URL, [1])
+    sync.fetch_youtrack_issues_bulk(YOUTRACK_URL, TOKEN, ["2-1"])
+
+    assert [url for _, url, _, _ in http.calls] == [
+        f"{REPO_URL}/issues/1",
+        f"{YOUTRACK_URL}/api/issues/2-1",
+    ]
+
+
+def test_fetch_failure_reports_status_code(http):
+    issues_file = setup_mapped_issue(http)
+    http.routes[("GET", f"{YOUTRACK_URL}/api/issues/2-1")] = StubResponse(403)
+
+    result = sync.sync_github_to_youtrack(YOUTRACK_URL, TOKEN, issues_file, dry_run=True)
+
+    assert result["errors"] == 1
+    assert result["results"][0]["message"] == "Failed to fetch YouTrack issue: 403"
+
+
+def test_invalid_mapping_key_is_reported_per_entry(http):
+    issues_file = setup_mapped_issue(http)
+
+    result = sync.sync_github_to_youtrack(
+        YOUTRACK_URL, TOKEN, issues_file, mappings={"abc": "2-9", "1": "2-1"}, dry_run=True
+    )
+
+    statuses = {r["github_number"]: r["status"] for r in result["results"]}
+    assert statuses == {"abc": "error", 1: "needs_update"}
+
+
+def test_sync_keeps_planned_fields_in_applied_results(http):
+    issues_file = setup_mapped_issue(http)
+
+    result = sync.sync_github_to_youtrack(YOUTRACK_URL, TOKEN, issues_file)
+
+    assert result["synced"] == 1
+    assert result["results"][0]["status"] == "updated"
+    assert result["results"][0]["github_updated"] == "2030-01-01T00:00:00Z"